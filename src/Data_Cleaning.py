@@ -1,11 +1,13 @@
+import atexit
+import hashlib
 import os
-import glob
 import logging
-import re
-import json
+import logging.handlers
 from datetime import datetime
+import orjson
 import requests
 
+from Data_Storage import PARSED_DATA_LOG, append_record, load_latest_parsed_record
 
 
 def setup_logging(logs_dir="logs"):
@@ -16,80 +18,119 @@ def setup_logging(logs_dir="logs"):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_filename = os.path.join(logs_dir, f"Data_Cleaning_{timestamp}.log")
 
+    # None of these record attributes are in the format; skip the lookups
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler = logging.FileHandler(log_filename)
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    # Buffer file writes; flush on ERROR, when the buffer fills, or at exit
+    memory_handler = logging.handlers.MemoryHandler(
+        capacity=1024, flushLevel=logging.ERROR, target=file_handler
+    )
+    atexit.register(memory_handler.flush)
+
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.FileHandler(log_filename),
-            logging.StreamHandler()
+            memory_handler,
+            stream_handler
         ]
     )
     logging.info(f"Logging initialized. Log file: {log_filename}")
     return timestamp
 
-def load_latest_parsed_data(data_dir="data", top_n=3):
+def _top_skills(data, top_n):
     """
-    Finds the latest parsed_data_*.json in data_dir,
-    loads it, and returns its first top_n skills (or [] if not available).
+    Return the first top_n skills of a parsed data payload. A list payload
+    is what an earlier cleaning run saved, i.e. already a skills list.
     """
-    os.makedirs(data_dir, exist_ok=True)
-    pattern = os.path.join(data_dir, "parsed_data_*.json")
-    files = glob.glob(pattern)
-    if not files:
-        logging.error(f"No parsed data files found in {data_dir}; please run parsing first.")
+    all_skills = data if isinstance(data, list) else data.get("skills", [])
+    if not isinstance(all_skills, list):
+        logging.warning(f"Expected 'skills' to be a list, got {type(all_skills)}. Returning empty.")
         return []
+    return all_skills[:top_n]
 
-    latest_file = max(files, key=os.path.getmtime)
+def _load_latest(data_dir, top_n):
+    """
+    Load the most recent parsed data record in data_dir.
+    Returns (path, record, top_skills), or (None, None, []) if nothing could be loaded.
+    """
+    os.makedirs(data_dir, exist_ok=True)
     try:
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        all_skills = data.get("skills", [])
-        if not isinstance(all_skills, list):
-            logging.warning(f"Expected 'skills' to be a list, got {type(all_skills)}. Returning empty.")
-            return []
-        # Return only the first top_n skills
-        top_skills = all_skills[:top_n]
-        logging.info(f"Loaded top {len(top_skills)} skills from: {latest_file}")
-        return top_skills
+        path, record = load_latest_parsed_record(data_dir)
+        if record is None:
+            logging.error(f"No parsed data found in {data_dir}; please run parsing first.")
+            return None, None, []
+        top_skills = _top_skills(record["data"], top_n)
+        logging.info(f"Loaded top {len(top_skills)} skills from: {path}")
+        return path, record, top_skills
 
     except Exception as e:
         logging.error(f"Failed to load parsed data: {e}")
-        return []
+        return None, None, []
+
+def load_latest_parsed_data(data_dir="data", top_n=3):
+    """
+    Loads the most recent parsed data record in data_dir
+    and returns its first top_n skills (or [] if not available).
+    """
+    return _load_latest(data_dir, top_n)[2]
 
 def save_parsed_data(parsed_data, data_dir=None):
     """
-    Save parsed data as a timestamped JSON file under data_dir (or ./data by default).
-    Returns the full path of the saved file, or None on error.
+    Append parsed data as one timestamped record to parsed_data.ndjson under
+    data_dir (or ./data by default).
+    Returns the full path of the log file, or None on error.
     """
     if data_dir is None:
         data_dir = os.path.join(os.getcwd(), "data")
     os.makedirs(data_dir, exist_ok=True)
 
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = os.path.join(data_dir, f"parsed_data_{ts}.json")
+    filename = os.path.join(data_dir, PARSED_DATA_LOG)
 
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(parsed_data, f, ensure_ascii=False, indent=4)
-        logging.info(f"Parsed data saved to: {filename}")
+        append_record(filename, ts, parsed_data)
+        logging.info(f"Parsed data appended to: {filename}")
         return filename
     except Exception as e:
         logging.error(f"Failed to save parsed data: {e}")
         return None
 
 
+def _content_hash(data):
+    """
+    Digest of data's JSON encoding, with keys sorted so dict order does not matter.
+    """
+    blob = orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+
 def main():
     # Kick off logging and (optionally) capture a timestamp for other uses
     setup_logging()
 
-    # Load the most recent parsed data
-    data = load_latest_parsed_data()
+    # Load the most recent parsed data, keeping the record it came from
+    data_dir = os.path.join(os.getcwd(), "data")
+    tail_path, tail, data = _load_latest(data_dir, top_n=3)
     if data is None:
         logging.error("No parsed data loaded; exiting.")
         return
 
+    # Skip the re-save when the log already ends with exactly what would be
+    # appended, i.e. the tail is an earlier cleaning run's output of this data.
+    if tail is not None and _content_hash(tail["data"]) == _content_hash(data):
+        os.utime(tail_path)
+        logging.info("Parsed data unchanged since last save; skipping re-save.")
+        return
+
     # Save (or re-save) the loaded data
-    saved_file = save_parsed_data(data)
+    saved_file = save_parsed_data(data, data_dir)
     if saved_file:
         logging.info(f"Parsed data re-saved to: {saved_file}")
     else:
@@ -1,13 +1,63 @@
 import argparse
+import asyncio
+import atexit
 import os
-import re
-import json
-import glob
 import logging
+import logging.handlers
 from datetime import datetime
+from urllib.parse import quote_plus
 
-import requests
-from bs4 import BeautifulSoup
+import aiohttp
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
+
+from Data_Storage import append_record, load_latest_parsed_record
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+MAX_RETRIES = 2
+BACKOFF_FACTOR = 0.2
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+HTTP_CACHE_PATH = os.path.join("Web-scraped", "http_cache.sqlite")
+HTTP_CACHE_EXPIRE = 3600
+SCRAPED_JOBS_LOG = "jobs.ndjson"
+
+SITE_TEMPLATES = (
+    ('indeed', 'https://www.indeed.com/jobs?q={}&l='),
+    ('monster', 'https://www.monster.com/jobs/search/?q={}&where='),
+    ('simplyhired', 'https://www.simplyhired.com/search?q={}&l='),
+)
+
+# Per-site card selectors for _parse. 'location' lists fallbacks tried in
+# order; 'link_prefix' is prepended to the relative href of 'link'.
+SITE_EXTRACTORS = {
+    'indeed': {
+        'card': 'div.jobsearch-SerpJobCard',
+        'title': 'h2.title',
+        'company': 'span.company',
+        'location': ('div.location', 'span.location'),
+        'link': 'a',
+        'link_prefix': 'https://www.indeed.com',
+    },
+    'monster': {
+        'card': 'section.card-content',
+        'title': 'h2.title',
+        'company': 'div.company',
+        'location': ('div.location',),
+        'link': 'a',
+        'link_prefix': '',
+    },
+    'simplyhired': {
+        'card': 'div.SerpJob-jobCard',
+        'title': 'a.jobposting-title',
+        'company': 'span.JobPosting-labelWithIcon',
+        'location': ('span.jobposting-location',),
+        'link': 'a.jobposting-title',
+        'link_prefix': 'https://www.simplyhired.com',
+    },
+}
 
 def setup_logging(logs_dir="logs"):
     """
@@ -17,12 +67,27 @@ def setup_logging(logs_dir="logs"):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_filename = os.path.join(logs_dir, f"Job_Search_{timestamp}.log")
 
+    # None of these record attributes are in the format; skip the lookups
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler = logging.FileHandler(log_filename)
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    # Buffer file writes; flush on ERROR, when the buffer fills, or at exit
+    memory_handler = logging.handlers.MemoryHandler(
+        capacity=1024, flushLevel=logging.ERROR, target=file_handler
+    )
+    atexit.register(memory_handler.flush)
+
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.FileHandler(log_filename),
-            logging.StreamHandler()
+            memory_handler,
+            stream_handler
         ]
     )
     logging.info(f"Logging initialized. Log file: {log_filename}")
@@ -31,117 +96,150 @@ def setup_logging(logs_dir="logs"):
 
 def load_latest_parsed_data(data_dir="data"):
     """
-    Find and load the most recent parsed_data_<timestamp>.json in data_dir.
+    Load the most recent parsed data record from data_dir.
     Returns tuple (parsed_data, timestamp) or (None, None) if not found.
     """
     os.makedirs(data_dir, exist_ok=True)
-    pattern = os.path.join(data_dir, "parsed_data_*.json")
-    files = glob.glob(pattern)
-    if not files:
-        logging.error(f"No parsed data files found in {data_dir}; please run parsing first.")
-        return None, None
-    latest_file = max(files, key=os.path.getmtime)
-    match = re.search(r'parsed_data_(\d{8}_\d{6})\.json', os.path.basename(latest_file))
-    timestamp = match.group(1) if match else datetime.now().strftime("%Y%m%d_%H%M%S")
     try:
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        logging.info(f"Loaded parsed data from: {latest_file}")
-        return data, timestamp
+        path, record = load_latest_parsed_record(data_dir)
     except Exception as e:
         logging.error(f"Failed to load parsed data: {e}")
         return None, None
+    if record is None:
+        logging.error(f"No parsed data found in {data_dir}; please run parsing first.")
+        return None, None
+    logging.info(f"Loaded parsed data from: {path} ({record['_ts']})")
+    return record["data"], record["_ts"]
 
 
 def construct_job_urls(skills):
     """
     Construct search URLs for job boards based on skills.
     """
-    base_urls = {
-        'indeed': 'https://www.indeed.com/jobs?q={query}&l=',
-        'monster': 'https://www.monster.com/jobs/search/?q={query}&where=',
-        'simplyhired': 'https://www.simplyhired.com/search?q={query}&l='
-    }
-    urls = []
-    for skill in skills:
-        q = "+".join(skill.split())
-        for site, template in base_urls.items():
-            urls.append((site, template.format(query=q)))
-    logging.info(f"Constructed {len(urls)} job search URLs.")
+    # Collapse whitespace, then let quote_plus escape '+', '#' etc. (C++, C#)
+    queries = [quote_plus(" ".join(skill.split())) for skill in skills]
+    urls = [(site, template.format(q)) for q in queries for site, template in SITE_TEMPLATES]
+    logging.info("Constructed %s job search URLs.", len(urls))
     return urls
 
 
-def scrape_jobs_from_url(site, url, max_posts=5):
+def _parse(site, html, max_posts=5):
     """
-    Scrape job postings from a single URL.
+    Parse job postings for a site out of a fetched HTML page,
+    using that site's selectors from SITE_EXTRACTORS.
+    """
+    cfg = SITE_EXTRACTORS.get(site)
+    if cfg is None:
+        return []
+    title_sel, company_sel = cfg['title'], cfg['company']
+    location_sels, link_sel, link_prefix = cfg['location'], cfg['link'], cfg['link_prefix']
+
+    jobs = []
+    tree = HTMLParser(html)
+    for card in tree.css(cfg['card'])[:max_posts]:
+        location = next((node for node in map(card.css_first, location_sels) if node is not None), None)
+        jobs.append({
+            'site': site,
+            'title': card.css_first(title_sel).text(strip=True),
+            'company': card.css_first(company_sel).text(strip=True),
+            'location': location.text(strip=True) if location is not None else '',
+            'link': link_prefix + card.css_first(link_sel).attributes['href'],
+        })
+    return jobs
+
+
+def _make_session(use_cache=True):
+    """
+    Create the shared HTTP session. Its connector pools keep-alive
+    connections, so repeat requests to a host reuse the TCP/TLS setup.
+    With use_cache, GET responses are kept in an on-disk SQLite cache
+    for HTTP_CACHE_EXPIRE seconds, so re-runs for the same skills skip
+    the network.
+    """
+    connector = aiohttp.TCPConnector(limit=32, limit_per_host=8, keepalive_timeout=30)
+    headers = {'User-Agent': USER_AGENT}
+    if not use_cache:
+        return aiohttp.ClientSession(connector=connector, headers=headers)
+    os.makedirs(os.path.dirname(HTTP_CACHE_PATH), exist_ok=True)
+    cache = SQLiteBackend(HTTP_CACHE_PATH, expire_after=HTTP_CACHE_EXPIRE, allowed_methods=('GET',))
+    return CachedSession(cache=cache, connector=connector, headers=headers)
+
+
+async def _fetch(session, url, semaphore):
+    """
+    Download a single URL and return the raw response body.
+    Connection errors, timeouts and 429/5xx responses are retried with
+    backoff. The semaphore is held per attempt, not during the backoff sleep.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        async with semaphore:
+            try:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                    if resp.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                        resp.raise_for_status()
+                        return await resp.read()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == MAX_RETRIES:
+                    raise
+        await asyncio.sleep(BACKOFF_FACTOR * (2 ** attempt))
+
+
+async def fetch(site, url, session, semaphore, max_posts=5):
+    """
+    Fetch a single job search URL and scrape its postings.
+    The semaphore caps how many requests are in flight at once.
     """
     jobs = []
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        if site == 'indeed':
-            cards = soup.find_all('div', class_='jobsearch-SerpJobCard')[:max_posts]
-            for card in cards:
-                title = card.find('h2', class_='title').get_text(strip=True)
-                company = card.find('span', class_='company').get_text(strip=True)
-                location = card.find('div', class_='location') or card.find('span', class_='location')
-                location = location.get_text(strip=True) if location else ''
-                link = 'https://www.indeed.com' + card.find('a')['href']
-                jobs.append({'site': site, 'title': title, 'company': company, 'location': location, 'link': link})
-
-        elif site == 'monster':
-            cards = soup.find_all('section', class_='card-content')[:max_posts]
-            for card in cards:
-                title = card.find('h2', class_='title').get_text(strip=True)
-                company = card.find('div', class_='company').get_text(strip=True)
-                location = card.find('div', class_='location').get_text(strip=True)
-                link = card.find('a')['href']
-                jobs.append({'site': site, 'title': title, 'company': company, 'location': location, 'link': link})
-
-        elif site == 'simplyhired':
-            cards = soup.find_all('div', class_='SerpJob-jobCard')[:max_posts]
-            for card in cards:
-                title = card.find('a', class_='jobposting-title').get_text(strip=True)
-                company = card.find('span', class_='JobPosting-labelWithIcon').get_text(strip=True)
-                location = card.find('span', class_='jobposting-location').get_text(strip=True)
-                link = 'https://www.simplyhired.com' + card.find('a', class_='jobposting-title')['href']
-                jobs.append({'site': site, 'title': title, 'company': company, 'location': location, 'link': link})
-
-        logging.info(f"Scraped {len(jobs)} jobs from {site}.")
+        html = await _fetch(session, url, semaphore)
     except Exception as e:
-        logging.error(f"Failed to scrape {site} at {url}: {e}")
+        logging.error("Failed to scrape %s at %s: %s", site, url, e)
+        return jobs
+    # Parsing is CPU-bound; run it in a worker thread (outside the semaphore)
+    # so other fetches keep progressing while this page is parsed
+    try:
+        jobs = await asyncio.to_thread(_parse, site, html, max_posts)
+        logging.info("Scraped %s jobs from %s.", len(jobs), site)
+    except Exception as e:
+        logging.error("Failed to parse %s results from %s: %s", site, url, e)
     return jobs
 
 
-def scrape_jobs(skills):
+async def scrape_jobs(skills, max_concurrency=8, use_cache=True):
     """
-    Scrape job postings for all skills and sites.
+    Scrape job postings for all skills and sites concurrently.
     """
     urls = construct_job_urls(skills)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    async with _make_session(use_cache) as session:
+        tasks = [fetch(site, url, session, semaphore) for site, url in urls]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
     all_jobs = []
-    for site, url in urls:
-        all_jobs.extend(scrape_jobs_from_url(site, url))
-    logging.info(f"Total jobs scraped: {len(all_jobs)}")
+    for (site, url), result in zip(urls, results):
+        if isinstance(result, BaseException):
+            logging.error("Failed to scrape %s at %s: %s", site, url, result)
+            continue
+        all_jobs.extend(result)
+    logging.info("Total jobs scraped: %s", len(all_jobs))
     return all_jobs
 
 def save_scraped_jobs(jobs, timestamp, scrape_dir="Web-scraped"):
     """
-    Save scraped job data into JSON file with timestamp.
+    Append scraped job data as one timestamped record to scrape_dir/jobs.ndjson.
     """
     os.makedirs(scrape_dir, exist_ok=True)
-    filename = os.path.join(scrape_dir, f"jobs_{timestamp}.json")
+    filename = os.path.join(scrape_dir, SCRAPED_JOBS_LOG)
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(jobs, f, indent=4)
-        logging.info(f"Scraped job data saved to: {filename}")
+        append_record(filename, timestamp, jobs)
+        logging.info(f"Scraped job data appended to: {filename}")
     except Exception as e:
         logging.error(f"Failed to save scraped jobs: {e}")
     return filename
 
 def main():
     parser = argparse.ArgumentParser(description="Job Scraper using saved resume data")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk HTTP response cache")
     args = parser.parse_args()
 
     timestamp = setup_logging()
@@ -151,7 +249,7 @@ def main():
         logging.error("No skills found in saved data; please ensure parsing has been run.")
         return
 
-    jobs = scrape_jobs(data['skills'])
+    jobs = asyncio.run(scrape_jobs(data['skills'], use_cache=not args.no_cache))
     save_scraped_jobs(jobs, timestamp)
 
     logging.info("Job scraping process completed.")
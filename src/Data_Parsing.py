@@ -1,12 +1,32 @@
 import argparse
+import atexit
 import os
 import re
-import json
 import logging
+import logging.handlers
+import mmap
+import multiprocessing
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 from pdfminer.high_level import extract_text as extract_text_from_pdf
-import docx
+from lxml import etree
+
+from Data_Storage import PARSED_DATA_LOG, append_record
+
+EMAIL_RE = re.compile(rb"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+PHONE_RE = re.compile(rb"\+?\d[\d\s\-()]{7,}\d")
+SKILLS_RE = re.compile(r"(?:Skills|Technical Skills)[:\n](.*?)(?:\n\n|$)", re.IGNORECASE | re.DOTALL)
+SKILL_SPLIT_RE = re.compile(r'[,\n]')
+# Every non-ASCII character a str-pattern \s matches, mapped to an ASCII space
+UNICODE_SPACES = str.maketrans(dict.fromkeys(
+    "\x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008"
+    "\u2009\u200a\u2028\u2029\u202f\u205f\u3000", " "))
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+# Text equivalents of run children, as python-docx's Run.text maps them; w:br is handled separately
+DOCX_RUN_TEXT = {W_NS + 'tab': "\t", W_NS + 'ptab': "\t", W_NS + 'cr': "\n", W_NS + 'noBreakHyphen': "-"}
 
 
 def setup_logging():
@@ -18,23 +38,97 @@ def setup_logging():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_filename = os.path.join(logs_dir, f"execution_{timestamp}.log")
 
+    # None of these record attributes are in the format; skip the lookups
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler = logging.FileHandler(log_filename)
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    # Buffer file writes; flush on ERROR, when the buffer fills, or at exit
+    memory_handler = logging.handlers.MemoryHandler(
+        capacity=1024, flushLevel=logging.ERROR, target=file_handler
+    )
+    atexit.register(memory_handler.flush)
+
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.FileHandler(log_filename),
-            logging.StreamHandler()
+            memory_handler,
+            stream_handler
         ]
     )
     logging.info(f"Logging initialized. Log file: {log_filename}")
     return timestamp
 
 
+def _docx_run_text(run):
+    """
+    Text of one w:r element, following python-docx's Run.text: page and
+    column breaks are dropped, only text-wrapping breaks become newlines.
+    """
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == W_NS + 't':
+            parts.append(child.text or "")
+        elif tag == W_NS + 'br':
+            if child.get(W_NS + 'type', 'textWrapping') == 'textWrapping':
+                parts.append("\n")
+        elif tag in DOCX_RUN_TEXT:
+            parts.append(DOCX_RUN_TEXT[tag])
+    return "".join(parts)
+
+
+def _extract_docx_text(filepath):
+    """
+    Stream paragraph text out of word/document.xml without building the
+    python-docx object model. Like Document.paragraphs, only body-level
+    paragraphs are kept; table cells and text boxes are skipped.
+    """
+    paragraphs = []
+    with zipfile.ZipFile(filepath) as z, z.open('word/document.xml') as f:
+        for _, elem in etree.iterparse(f, tag=(W_NS + 'p', W_NS + 'tbl')):
+            # Nested paragraphs are freed along with their body-level ancestor
+            if elem.getparent().tag != W_NS + 'body':
+                continue
+            if elem.tag == W_NS + 'p':
+                runs = []
+                for child in elem:
+                    if child.tag == W_NS + 'r':
+                        runs.append(_docx_run_text(child))
+                    elif child.tag == W_NS + 'hyperlink':
+                        runs.extend(_docx_run_text(r) for r in child.iterchildren(W_NS + 'r'))
+                paragraphs.append("".join(runs))
+            elem.clear()
+    return "\n".join(paragraphs)
+
+
+def _read_text_file(filepath):
+    """
+    Decode a plain-text file straight from a read-only memory map,
+    skipping the intermediate bytes copy of f.read().
+    """
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                text = str(view, 'utf-8', 'ignore')
+    # Keep text-mode universal newlines; parse_skills relies on '\n\n'
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
 def extract_text(filepath):
     """
     Extract text from PDF or DOCX file.
     """
-    logging.info(f"Extracting text from: {filepath}")
+    logging.info("Extracting text from: %s", filepath)
     _, ext = os.path.splitext(filepath)
     ext = ext.lower()
     text = ""
@@ -42,14 +136,15 @@ def extract_text(filepath):
         if ext == ".pdf":
             text = extract_text_from_pdf(filepath)
         elif ext in [".docx", ".doc"]:
-            doc = docx.Document(filepath)
-            text = "\n".join([para.text for para in doc.paragraphs])
+            text = _extract_docx_text(filepath)
         else:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                text = f.read()
+            text = _read_text_file(filepath)
         logging.info("Text extraction successful.")
+        # Full resume text is large; only touch it when debugging
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Raw text (%d chars): %s", len(text), text)
     except Exception as e:
-        logging.error(f"Failed to extract text: {e}")
+        logging.error("Failed to extract text: %s", e)
     return text
 
 
@@ -58,16 +153,20 @@ def parse_email_phone(text):
     Parse email addresses and phone numbers from text.
     """
     logging.info("Parsing email and phone.")
-    email_pattern = r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+"
-    phone_pattern = r"\+?\d[\d\s\-()]{7,}\d"
+    # Bytes patterns only treat ASCII as \s; map the Unicode spaces pdfminer can
+    # emit (e.g. NBSP inside "+91\xa0...") to ' ' first. Non-ASCII digits no
+    # longer count as \d, which is intended: phones are matched on ASCII digits.
+    if not text.isascii():
+        text = text.translate(UNICODE_SPACES)
+    data = text.encode('utf-8', 'ignore')
+    emails = EMAIL_RE.findall(data)
+    phones = PHONE_RE.findall(data)
+    # dict.fromkeys dedups while keeping first-seen order
+    emails = [m.decode() for m in dict.fromkeys(emails)]
+    phones = [m.decode() for m in dict.fromkeys(phones)]
 
-    emails = re.findall(email_pattern, text)
-    phones = re.findall(phone_pattern, text)
-    emails = list(set(emails))
-    phones = list(set(phones))
-
-    logging.info(f"Found emails: {emails}")
-    logging.info(f"Found phones: {phones}")
+    logging.info("Found emails: %s", emails)
+    logging.info("Found phones: %s", phones)
 
     return emails, phones
 
@@ -79,7 +178,7 @@ def parse_name(text):
     logging.info("Parsing name.")
     lines = [line.strip() for line in text.splitlines() if line.strip()]
     name = lines[0] if lines else ""
-    logging.info(f"Assumed name: {name}")
+    logging.info("Assumed name: %s", name)
     return name
 
 
@@ -89,54 +188,90 @@ def parse_skills(text):
     """
     logging.info("Parsing skills section.")
     skills = []
-    pattern = re.compile(r"(?:Skills|Technical Skills)[:\n](.*?)(?:\n\n|$)", re.IGNORECASE | re.DOTALL)
-    match = pattern.search(text)
+    match = SKILLS_RE.search(text)
     if match:
         skills_text = match.group(1)
         # Split by comma or newline
-        skills = [s.strip() for s in re.split('[,\n]', skills_text) if s.strip()]
-    logging.info(f"Extracted skills: {skills}")
+        skills = [s.strip() for s in SKILL_SPLIT_RE.split(skills_text) if s.strip()]
+    logging.info("Extracted skills: %s", skills)
     return skills
 
 
 def save_parsed_data(parsed_data, timestamp):
     """
-    Save parsed data to JSON file with timestamp.
+    Append parsed data as one timestamped record to data/parsed_data.ndjson.
     """
     data_dir = os.path.join(os.getcwd(), "data")
     os.makedirs(data_dir, exist_ok=True)
-    filename = os.path.join(data_dir, f"parsed_data_{timestamp}.json")
+    filename = os.path.join(data_dir, PARSED_DATA_LOG)
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(parsed_data, f, indent=4)
-        logging.info(f"Parsed data saved to: {filename}")
+        append_record(filename, timestamp, parsed_data)
+        logging.info(f"Parsed data appended to: {filename}")
     except Exception as e:
         logging.error(f"Failed to save parsed data: {e}")
     return filename
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Resume Data Parser")
-    parser.add_argument("--resume", required=True, help="Path to resume file (PDF, DOCX, TXT)")
-    args = parser.parse_args()
-
-    timestamp = setup_logging()
-    text = extract_text(args.resume)
+def parse_one(filepath):
+    """
+    Extract and parse a single resume into the parsed data dict.
+    """
+    text = extract_text(filepath)
 
     name = parse_name(text)
     emails, phones = parse_email_phone(text)
     skills = parse_skills(text)
 
-    parsed = {
+    return {
         "name": name,
         "emails": emails,
         "phones": phones,
         "skills": skills,
-        "source": os.path.abspath(args.resume),
+        "source": os.path.abspath(filepath),
         "parsed_at": datetime.now().isoformat()
     }
 
-    save_parsed_data(parsed, timestamp)
+
+def _init_worker_logging(log_queue):
+    """
+    Route a worker process's logging through log_queue so only the parent
+    writes to the log file.
+    """
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(logging.INFO)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume Data Parser")
+    parser.add_argument("--resume", required=True, nargs='+', help="Path(s) to resume files (PDF, DOCX, TXT)")
+    args = parser.parse_args()
+
+    timestamp = setup_logging()
+
+    if len(args.resume) == 1:
+        save_parsed_data(parse_one(args.resume[0]), timestamp)
+        logging.info("Data parsing completed.")
+        return
+
+    log_queue = multiprocessing.Queue()
+    listener = logging.handlers.QueueListener(
+        log_queue, *logging.getLogger().handlers, respect_handler_level=True
+    )
+    listener.start()
+    try:
+        workers = min(len(args.resume), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker_logging,
+                                 initargs=(log_queue,)) as ex:
+            futures = [ex.submit(parse_one, path) for path in args.resume]
+            # Save in command-line order so the log's tail is always the last --resume
+            for path, fut in zip(args.resume, futures):
+                try:
+                    save_parsed_data(fut.result(), timestamp)
+                except Exception as e:
+                    logging.error("Failed to parse %s: %s", path, e)
+    finally:
+        listener.stop()
     logging.info("Data parsing completed.")
 
 if __name__ == "__main__":
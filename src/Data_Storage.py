@@ -0,0 +1,218 @@
+import functools
+import logging
+import os
+import re
+from datetime import datetime
+
+import orjson
+
+try:
+    import liburing
+except ImportError:  # io_uring is Linux-only; load_many_parsed_data reads serially without it
+    liburing = None
+
+IO_URING_ENTRIES = 64
+
+PARSED_DATA_LOG = "parsed_data.ndjson"
+LEGACY_TS_RE = re.compile(r'parsed_data_(\d{8}_\d{6})\.json')
+
+
+def append_bytes(filename, blob):
+    """
+    Append blob to filename with an O_APPEND write and fsync it.
+    If an earlier append was cut off mid-line, a newline is written first
+    so blob starts a line of its own instead of being glued onto the torn one.
+    The scripts only fetch the log's last record, so the kernel is told
+    to drop the file's cached pages afterwards.
+    """
+    flags = os.O_RDWR | os.O_CREAT | os.O_APPEND | getattr(os, "O_CLOEXEC", 0)
+    fd = os.open(filename, flags, 0o644)
+    try:
+        size = os.fstat(fd).st_size
+        if size and os.pread(fd, 1, size - 1) != b"\n":
+            blob = b"\n" + blob
+        view = memoryview(blob)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def append_record(filename, timestamp, data):
+    """
+    Append data as one {"_ts": timestamp, "data": data} line to the NDJSON log filename.
+    """
+    record = {"_ts": timestamp, "data": data}
+    append_bytes(filename, orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE))
+
+
+def iter_lines_reversed(path, chunk_size=8192):
+    """
+    Yield the non-empty lines of path from last to first, reading backwards
+    from the end in chunk_size blocks so only the tail of the log is touched
+    when the caller stops early.
+    """
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        head = b""
+        while pos > 0:
+            step = min(chunk_size, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + head).split(b"\n")
+            # The first piece may continue in the previous block
+            head = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if head.strip():
+            yield head
+
+
+@functools.lru_cache(maxsize=4)
+def read_last_record(path, mtime_ns):
+    """
+    Decode the newest record of an NDJSON log, or return None if it has none.
+    A line that does not decode (an append cut off mid-write) is skipped in
+    favour of the one before it. Cached on (path, mtime_ns) so repeated loads
+    in one process skip the read, and an append (which bumps mtime) is picked up.
+    """
+    for line in iter_lines_reversed(path):
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            logging.warning("Skipping undecodable line in %s: %s", path, e)
+    return None
+
+
+@functools.lru_cache(maxsize=4)
+def read_json_file(path, mtime_ns):
+    """
+    Read and decode a whole JSON file, cached on (path, mtime_ns) like read_last_record.
+    """
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+def _read_files_uring(paths):
+    """
+    Read whole files with io_uring, submitting up to IO_URING_ENTRIES reads
+    per batch and collecting their completions.
+    Returns a list aligned with paths holding bytes, or the OSError raised for that file.
+    """
+    blobs = [None] * len(paths)
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    liburing.io_uring_queue_init(IO_URING_ENTRIES, ring)
+    try:
+        for base in range(0, len(paths), IO_URING_ENTRIES):
+            fds = {}
+            bufs = {}
+            try:
+                for i in range(base, min(base + IO_URING_ENTRIES, len(paths))):
+                    try:
+                        fd = os.open(paths[i], os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+                        fds[i] = fd
+                        bufs[i] = bytearray(os.fstat(fd).st_size)
+                    except OSError as e:
+                        blobs[i] = e
+                        continue
+                    sqe = liburing.io_uring_get_sqe(ring)
+                    liburing.io_uring_prep_read(sqe, fd, bufs[i], 0)
+                    sqe.user_data = i
+                liburing.io_uring_submit(ring)
+
+                for _ in range(len(bufs)):
+                    liburing.io_uring_wait_cqe(ring, cqe)
+                    i = cqe[0].user_data
+                    try:
+                        # liburing raises the failed read's errno when res is read
+                        res = cqe[0].res
+                    except OSError as e:
+                        blobs[i] = OSError(e.errno, e.strerror, paths[i])
+                        continue
+                    finally:
+                        liburing.io_uring_cqe_seen(ring, cqe[0])
+                    blob = bytes(bufs[i][:res])
+                    if res < len(bufs[i]):
+                        # Short read; fetch the remainder synchronously
+                        blob += os.pread(fds[i], len(bufs[i]) - res, res)
+                    blobs[i] = blob
+            finally:
+                for fd in fds.values():
+                    os.close(fd)
+    finally:
+        liburing.io_uring_queue_exit(ring)
+    return blobs
+
+
+def load_many_parsed_data(paths):
+    """
+    Load every record from several parsed_data.ndjson logs in one go, e.g. for
+    batch cleaning. Reads are batched through io_uring when liburing is available.
+    Returns a list aligned with paths: each entry is that log's list of
+    {"_ts", "data"} records, or None if the file could not be read. Lines
+    that do not decode (torn appends) are skipped.
+    """
+    if liburing is not None:
+        blobs = _read_files_uring(paths)
+    else:
+        blobs = []
+        for path in paths:
+            try:
+                with open(path, 'rb') as f:
+                    blobs.append(f.read())
+            except OSError as e:
+                blobs.append(e)
+
+    results = []
+    for path, blob in zip(paths, blobs):
+        if isinstance(blob, OSError):
+            logging.error("Failed to read %s: %s", path, blob)
+            results.append(None)
+            continue
+        records = []
+        for line in blob.splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(orjson.loads(line))
+            except orjson.JSONDecodeError as e:
+                logging.warning("Skipping undecodable line in %s: %s", path, e)
+        results.append(records)
+    logging.info("Loaded %d/%d parsed data logs.", sum(r is not None for r in results), len(paths))
+    return results
+
+
+def load_latest_parsed_record(data_dir):
+    """
+    Return (path, record) for the newest parsed data in data_dir, or (None, None).
+    record is the last {"_ts", "data"} line of parsed_data.ndjson. Data saved
+    before the log existed lives in per-run parsed_data_<timestamp>.json
+    files; if there is no log yet (or it holds no readable record), the
+    newest of those is returned in the same shape.
+    """
+    log_path = os.path.join(data_dir, PARSED_DATA_LOG)
+    try:
+        record = read_last_record(log_path, os.stat(log_path).st_mtime_ns)
+    except FileNotFoundError:
+        record = None
+    if record is not None:
+        return log_path, record
+
+    with os.scandir(data_dir) as it:
+        latest = max(
+            (e for e in it
+             if e.is_file(follow_symlinks=False)
+             and e.name.startswith("parsed_data_") and e.name.endswith(".json")),
+            key=lambda e: e.stat().st_mtime_ns,
+            default=None)
+    if latest is None:
+        return None, None
+    match = LEGACY_TS_RE.search(latest.name)
+    timestamp = match.group(1) if match else datetime.now().strftime("%Y%m%d_%H%M%S")
+    data = read_json_file(latest.path, latest.stat().st_mtime_ns)
+    return latest.path, {"_ts": timestamp, "data": data}